@@ -1,7 +1,14 @@
+import functools
 import json
 from typing import Union, GenericMeta, List, get_type_hints
 from openapilib import serialize_spec, spec
 
+# Resolving type hints is comparatively expensive, cache them per handler.
+# Call ``_cached_hints.cache_clear()`` if handlers are re-decorated, e.g. on
+# reload.
+_cached_hints = functools.lru_cache(maxsize=None)(get_type_hints)
+
+
 def api_route(
         summary: str=None,
         description: str=None,
@@ -35,7 +42,7 @@ def api_route(
         if response_type is not None:
             response_type_ = response_type
         else:
-            response_type_ = get_type_hints(func).get('return')
+            response_type_ = _cached_hints(func).get('return')
 
         if request_body_type is not None:
             request_body_type_ = request_body_type
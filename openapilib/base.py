@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 import attr
 
@@ -14,7 +14,32 @@ class Base:
 
     @classmethod
     def fields_by_name(cls):
-        return {field.name: field for field in attr.fields(cls)}
+        # Looked up in the class' own __dict__, a subclass must not reuse
+        # the mapping of its base class.
+        try:
+            return cls.__dict__['_FIELDS_BY_NAME']
+        except KeyError:
+            fields = {field.name: field for field in attr.fields(cls)}
+            cls._FIELDS_BY_NAME = fields
+            return fields
+
+    @classmethod
+    def serialization_plan(cls) -> Tuple[Tuple[str, str], ...]:
+        """
+        ``(attribute_name, spec_name)`` pairs for the attributes that are
+        part of the spec, in serialization order.
+        """
+        try:
+            return cls.__dict__['_SERIALIZATION_PLAN']
+        except KeyError:
+            from .serialization import rename_key
+            plan = tuple(
+                (field.name, rename_key(field.name, field))
+                for field in attr.fields(cls)
+                if not field.metadata.get('non_spec')
+            )
+            cls._SERIALIZATION_PLAN = plan
+            return plan
 
     def to_dict(self):
         from .serialization import spec_to_dict
@@ -29,7 +54,7 @@ class Base:
         )
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class MayBeReferenced:
     ref_name: Optional[str] = attr.ib(
         default=None,
@@ -21,8 +21,11 @@ def convert_skippable(
     ],
     'Skippable[T]'
 ]:
+    # Imported here rather than at module level to avoid a circular import,
+    # once per converter instead of once per converted value.
+    from .spec import SKIP
+
     def convert_if_not_skip(value: 'Skippable[Any]') -> 'Skippable[T]':
-        from .spec import SKIP
         if value is SKIP:
             return SKIP
         else:
@@ -31,29 +34,47 @@ def convert_skippable(
     return convert_if_not_skip
 
 
+_MISSING = object()
+
+
 class LazyString:
-    NOTHING = object()
+    """
+    Defers ``callback()`` until the string value is needed, e.g. when a log
+    record is actually emitted. The result is computed once.
+
+    The result is kept in a slot rather than using
+    :func:`functools.cached_property`, which needs an instance ``__dict__``
+    and Python 3.8.
+    """
+    __slots__ = ('callback', '_result')
 
     def __init__(self, callback):
         self.callback = callback
-        self._result = self.NOTHING
+        self._result = _MISSING
 
     @property
     def result(self):
-        if self._result is self.NOTHING:
-            self._result = self.callback()
-        return self._result
+        result = self._result
+        if result is _MISSING:
+            result = self._result = self.callback()
+            # Release whatever the callback closes over, e.g. spec objects.
+            self.callback = None
+        return result
 
     def __str__(self):
         return self.result
 
 
 class LazyPretty(LazyString):
+    __slots__ = ()
+
     def __str__(self):
         return '\n' + pretty_json(self.result)
 
 
 class Pretty:
+    __slots__ = ('obj',)
+
     def __init__(self, obj):
         self.obj = obj
 
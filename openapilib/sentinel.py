@@ -27,7 +27,8 @@ class Sentinel:
     'DEFAULT'
     """
     def __init__(self, name, doc=None):
-        _log.debug('Creating Sentinel, name=%r, doc=%r', name, doc)
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug('Creating Sentinel, name=%r, doc=%r', name, doc)
         self.name = name
         if self.__doc__ is not None:
             self.__doc__ = doc
@@ -1,9 +1,17 @@
 import logging
-from typing import Optional, Union, Any, List, Dict
+import re
+from typing import (
+    Optional,
+    Union,
+    Any,
+    List,
+    Dict,
+    Callable,
+    Tuple,
+    FrozenSet,
+)
 
 import attr
-import deepdiff
-import stringcase
 
 from openapilib.helpers import LazyPretty
 from openapilib.spec import (
@@ -20,7 +28,15 @@ _log = logging.getLogger(__name__)
 def serialize_spec(spec: OpenAPI, disable_referencing=False) -> Dict:
     """
     Serialize an OpenAPI spec.
+
+    Returns the serialized document stored by :any:`OpenAPI.freeze`, if the
+    spec has been frozen. That dict is shared between calls and must not be
+    modified.
     """
+    frozen = getattr(spec, '_frozen', None)
+    if frozen is not None:
+        return frozen
+
     if spec.components is not None and spec.components is not SKIP:
         components = spec.components
     else:
@@ -51,6 +67,27 @@ def serialize(spec: Base) -> Dict:
     use :any:`serialize_spec`.
 
     References are not generated by this method.
+
+    Spec objects used in several places are serialized to separate
+    containers, the output can be modified in one place without affecting
+    the others:
+
+    >>> from openapilib.spec import Schema
+    >>> shared = Schema.from_type(int)
+    >>> out = serialize(Schema(properties={'a': shared, 'b': shared}))
+    >>> out['properties']['a'] == out['properties']['b']
+    True
+    >>> out['properties']['a'] is out['properties']['b']
+    False
+
+    A spec that contains itself can not be serialized without references:
+
+    >>> node = Schema(ref_name='Node')
+    >>> node.properties = {'children': Schema(type='array', items=node)}
+    >>> serialize(node)
+    Traceback (most recent call last):
+    ...
+    RecursionError: Can not serialize Schema 'Node', it contains itself. ...
     """
     # Serialize components with referencing disabled, in order for them
     # not to try circular-reference themselves .
@@ -65,68 +102,120 @@ class SerializationContext:
     components: Optional['Components'] = attr.ib(default=None)
 
     def serialize(self, obj: Union['Base', Any]):
-        if isinstance(obj, Base):
-            # Try to serialize as a reference
-            reference = self.serialize_maybe_reference(obj)
-            if reference is not None:
-                value = reference
+        # Walks the tree with a stack of (container, key) pairs rather than
+        # recursing, the output containers are created up front and their
+        # values replaced in place. Children are pushed in reverse, so that
+        # specs are visited, and stored in Components, in document order.
+        # Each entry carries the ids of the values it is nested in, to detect
+        # cycles.
+        root = [obj]
+        stack: List[Tuple[Union[list, dict], Any, FrozenSet[int]]] = [
+            (root, 0, frozenset())
+        ]
+        pop = stack.pop
+        extend = stack.extend
+
+        while stack:
+            container, key, ancestors = pop()
+            value = container[key]
+
+            if isinstance(value, Base):
+                # Each occurrence gets its own output, even if the spec object
+                # is shared, e.g. the Schemas returned by Schema.from_type().
+                # Try to serialize as a reference
+                converted = self.serialize_maybe_reference(value)
+                if converted is not None:
+                    # Nothing but the "$ref" string
+                    container[key] = converted
+                    continue
+
+                converted = spec_to_dict(value)
+                # Dictionary views are not reversible before Python 3.8
+                keys = list(converted)
+            elif isinstance(value, dict):
+                converted = dict(value)
+                keys = list(converted)
+            elif isinstance(value, (list, tuple, set)):
+                converted = list(value)
+                keys = range(len(converted))
             else:
-                value = spec_to_dict(obj)
-        else:
-            value = obj
+                continue
+
+            if id(value) in ancestors:
+                raise RecursionError(_cycle_message(value))
 
-        # Handled possibly nested values
+            container[key] = converted
+            ancestors = ancestors | {id(value)}
+            extend(
+                (converted, child_key, ancestors)
+                for child_key in reversed(keys)
+                if type(converted[child_key]) not in _SCALAR_TYPES
+            )
 
-        return self.serialize_value(value)
+        return root[0]
 
     def serialize_maybe_reference(self, spec: 'Base'):
         """
         Serialize an object that may be referenced by storing the definition
         in Components and returning a reference.
         """
+        # Checked once, most objects pass through here without logging
+        # anything, and the LazyPretty closures are only needed when debugging.
+        debug = _log.isEnabledFor(logging.DEBUG)
+
         if not isinstance(spec, MayBeReferenced):
-            _log.debug(
-                'Object of type %s may not be referenced',
-                type(spec)
-            )
+            if debug:
+                _log.debug(
+                    'Object of type %s may not be referenced',
+                    type(spec)
+                )
             return
 
         if self.disable_referencing:
-            _log.debug(
-                'Referencing disabled, not referencing. ref_name=%r',
-                spec.ref_name,
-            )
+            if debug:
+                _log.debug(
+                    'Referencing disabled, not referencing. ref_name=%r',
+                    spec.ref_name,
+                )
             return
 
         if spec.ref_name is None:
-            _log.debug('No ref_name set, not referencing. spec=%')
+            if debug:
+                _log.debug('No ref_name set, not referencing. spec=%')
             return
 
         # Store definition in context, return reference
-        _log.debug(
-            'trying to reference, ref_name=%r',
-            spec.ref_name,
-        )
-        existing = self.components.get_stored(spec)
-        if existing:
-            _log.debug(
-                'Found existing: %r.',
-                existing.ref_name,
-                extra=dict(
-                    diff=LazyPretty(
-                        lambda: deepdiff.DeepDiff(
-                            serialize(existing),
-                            serialize(spec)
-                        )
-                    ),
-                )
-            )
-        else:
+        if debug:
             _log.debug(
-                'Storing %r:%s',
+                'trying to reference, ref_name=%r',
                 spec.ref_name,
-                LazyPretty(lambda: serialize(spec)),
             )
+        existing = self.components.get_stored(spec)
+        if existing is not None:
+            if debug:
+                if existing is spec:
+                    # The common case, the same spec used in several places.
+                    _log.debug('Found existing: %r.', existing.ref_name)
+                else:
+                    _log.debug(
+                        'Found existing: %r.',
+                        existing.ref_name,
+                        extra=dict(
+                            diff=LazyPretty(
+                                lambda: _deep_diff(
+                                    serialize(existing),
+                                    serialize(spec)
+                                )
+                            ),
+                        )
+                    )
+        else:
+            if debug:
+                _log.debug(
+                    'Storing %r:%s',
+                    spec.ref_name,
+                    LazyPretty(lambda: serialize(spec)),
+                )
             self.components.store(spec)
 
         return spec_to_dict(
@@ -137,18 +226,33 @@ class SerializationContext:
 
     def serialize_value(self, value):
         """
-        Serializes container types, such as list, dict, tuple, set.
+        Same as :any:`serialize`, kept for backwards compatibility.
+
+        Converts spec objects as well as containers such as list, dict, tuple
+        and set. Dict keys are used as-is, they are not serialized.
         """
-        if isinstance(value, dict):
-            return {
-                self.serialize(k): self.serialize(v)
-                for k, v in value.items()
-            }
+        return self.serialize(value)
+
+
+#: Types of values that :any:`SerializationContext.serialize` returns as-is.
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _cycle_message(value) -> str:
+    ref_name = getattr(value, 'ref_name', None)
+    return (
+        'Can not serialize {type}{name}, it contains itself. Use a Reference '
+        'for the recursive occurrence.'.format(
+            type=type(value).__name__,
+            name='' if ref_name is None else ' {!r}'.format(ref_name),
+        )
+    )
 
-        if isinstance(value, (list, tuple, set)):
-            return [self.serialize(v) for v in value]
 
-        return value
+def _deep_diff(a, b):
+    # deepdiff is slow to import and only used for debug logging.
+    import deepdiff
+    return deepdiff.DeepDiff(a, b)
 
 
 def spec_to_dict(spec: 'Base'):
@@ -156,21 +260,46 @@ def spec_to_dict(spec: 'Base'):
     Serializes instances of objects that inherit from
     :class:`Base`.
     """
+    spec_type = type(spec)
+    try:
+        to_dict = spec_type.__dict__['_SPEC_TO_DICT']
+    except KeyError:
+        to_dict = spec_type._SPEC_TO_DICT = _compile_spec_to_dict(spec_type)
 
-    fields = spec.fields_by_name()
+    return to_dict(spec)
 
-    filtered = attr.asdict(
-        spec,
-        filter=filter_attributes,
-        recurse=False,
-    )
 
-    serialized = {
-        rename_key(key, fields[key]): value
-        for key, value in filtered.items()
-    }
+def _compile_spec_to_dict(spec_type: type) -> Callable[['Base'], Dict]:
+    """
+    Generate a function equivalent to looping over
+    :any:`Base.serialization_plan`, with the attribute and spec names
+    inlined.
+    """
+    lines = [
+        'def spec_to_dict(spec):',
+        '    serialized = {}',
+    ]
 
-    return serialized
+    fields = spec_type.fields_by_name()
+
+    for name, spec_name in spec_type.serialization_plan():
+        if fields[name].metadata.get('skip_empty'):
+            condition = 'value is not SKIP and value'
+        else:
+            condition = 'value is not SKIP'
+
+        lines += [
+            f'    value = spec.{name}',
+            f'    if {condition}:',
+            f'        serialized[{spec_name!r}] = value',
+        ]
+
+    lines.append('    return serialized')
+
+    namespace = {'SKIP': SKIP}
+    filename = f'<openapilib spec_to_dict {spec_type.__qualname__}>'
+    exec(compile('\n'.join(lines), filename, 'exec'), namespace)
+    return namespace['spec_to_dict']
 
 
 def rename_key(key: str, a: attr.Attribute) -> str:
@@ -183,10 +312,40 @@ def rename_key(key: str, a: attr.Attribute) -> str:
         key = key[:-1]
 
     #: Name of field according to spec.
-    spec_name = a.metadata.get('spec_name', stringcase.camelcase(key))
+    spec_name = a.metadata.get('spec_name')
+    if spec_name is None:
+        spec_name = _camelcase(key)
     return spec_name
 
 
+#: Separator followed by the letter to uppercase, as in stringcase.camelcase.
+_CAMELCASE_BOUNDARY = re.compile(r'_([a-z])')
+
+
+def _camelcase(key: str) -> str:
+    """
+    Convert a snake_case attribute name to the spec's camelCase, the same
+    way ``stringcase.camelcase`` does for ``_``-separated names: only the
+    first character is lowercased, and only lowercase letters following a
+    ``_`` are uppercased.
+
+    >>> _camelcase('additional_properties')
+    'additionalProperties'
+    >>> _camelcase('format')
+    'format'
+    >>> _camelcase('fooBar_baz')
+    'fooBarBaz'
+    >>> _camelcase('ipv4_2')
+    'ipv4_2'
+    """
+    if not key:
+        return key
+    return key[0].lower() + _CAMELCASE_BOUNDARY.sub(
+        lambda match: match.group(1).upper(),
+        key[1:],
+    )
+
+
 def filter_attributes(attribute: attr.Attribute, value):
     is_skipped = value is SKIP
     non_spec = attribute.metadata.get('non_spec')
@@ -1,8 +1,10 @@
 import datetime
 import enum
+import functools
+import inspect
 import logging
-import posixpath
-from functools import partial
+import sys
+from types import MappingProxyType
 from typing import (
     Dict,
     Any,
@@ -14,8 +16,8 @@ from typing import (
     Type,
     TypeVar,
     Set,
-    cast,
     Iterable,
+    Mapping,
     Generic,
     ClassVar,
     Tuple,
@@ -65,6 +67,93 @@ SchemaFallbackHandlerType = Callable[
     ],
     Optional['Schema']
 ]
+_CLASSVAR_TYPE = type(ClassVar)
+_ANY_TYPE = type(Any)
+_GENERIC_TYPES = (
+    type(List),
+    type(Dict),
+    type(Union),
+)
+#: Types of the :mod:`typing` objects handled by :any:`Schema.from_type_hint`.
+_TYPE_HINT_TYPES = (_CLASSVAR_TYPE, _ANY_TYPE) + _GENERIC_TYPES
+
+#: User types that are being converted by :any:`Schema.from_user_type`, and
+#: the Reference used by recursive occurrences of each, if any.
+SchemaVisitedType = Dict[type, Optional['Reference']]
+
+
+def _is_user_type(source: type) -> bool:
+    """
+    Whether :any:`Schema.from_type` tries :any:`Schema.from_user_type` for the
+    class ``source``: :class:`object`, and classes with no base class other
+    than :class:`object` that are not in :any:`SCHEMA_SIMPLE_TYPE_ARGS`.
+    Classes without any properties, e.g. :class:`bytes`, are not handled by
+    :any:`Schema.from_type` either way.
+
+    >>> class Pet(object):
+    ...     name = str
+    ...
+    >>> _is_user_type(Pet), _is_user_type(str)
+    (True, False)
+    """
+    if source is object:
+        return True
+    return (
+        source.__bases__ == (object,)
+        and source not in SCHEMA_SIMPLE_TYPE_ARGS
+    )
+
+
+def _is_behaviour(value: Any) -> bool:
+    """
+    Whether the class attribute ``value`` is a method, property or other
+    descriptor rather than a property type, see :any:`Schema.from_user_type`.
+    """
+    return inspect.isroutine(value) or inspect.isdatadescriptor(value)
+
+
+def _user_type_properties(user_type: type) -> Dict[str, Any]:
+    """
+    The ``property_name: property_type`` class attributes of ``user_type``.
+
+    Raises :any:`SchemaHelperError` for fields that are only declared through
+    annotations or attrs, which are not read.
+
+    >>> class Pet(object):
+    ...     name: str
+    ...
+    >>> _user_type_properties(Pet)
+    Traceback (most recent call last):
+    ...
+    openapilib.spec.SchemaHelperError: Can not read the fields ['name'] of ...
+    """
+    properties = {
+        key: value
+        for key, value in user_type.__dict__.items()
+        if not key.startswith('_') and not _is_behaviour(value)
+    }
+
+    declared = list(user_type.__dict__.get('__annotations__', ()))
+    declared += [
+        field.name
+        for field in user_type.__dict__.get('__attrs_attrs__', ())
+    ]
+    unreadable = [
+        name
+        for name in declared
+        if not name.startswith('_') and name not in properties
+    ]
+    if unreadable:
+        raise SchemaHelperError(
+            'Can not read the fields {names} of {type!r}, only class '
+            'attributes holding a type are supported.'.format(
+                names=unreadable,
+                type=user_type,
+            )
+        )
+
+    return properties
+
 
 SKIP = Sentinel('SKIP', """
 Used as Object attribute default value to mark an attribute as skippable,
@@ -108,11 +197,22 @@ class StringFormat(enum.Enum):
     JSON_POINTER = 'json-pointer'
 
 
-def enum_to_string(member: enum.Enum):
-    return member.value
+def enum_to_string(member: Union[enum.Enum, str]) -> str:
+    """
+    >>> enum_to_string(ParameterLocation.PATH)
+    'path'
+    >>> enum_to_string('path')
+    'path'
+    """
+    if isinstance(member, enum.Enum):
+        return member.value
+    return member
 
 
 def attr_skippable(**kwargs) -> Skippable:
+    # Every call must return a new attr.ib(): attrs orders fields by the
+    # creation counter of each attr.ib(), sharing one instance between fields
+    # would reorder them, along with __init__ arguments and serialized keys.
     kwargs.setdefault('default', SKIP)
     return attr.ib(**kwargs)
 
@@ -138,25 +238,26 @@ ValidatorType = Callable[[Base, attr.Attribute, Any], None]
 def attr_required(**kwargs):
     kwargs.setdefault('default', REQUIRED)
     validator: Union[
+        None,
         ValidatorType,
-        List[ValidatorType]
-    ] = kwargs.get('validator', [])
-    if not isinstance(validator, list):
-        if not callable(validator):
-            raise TypeError(
-                'validator is not callable: {validator!r}'.format(
-                    validator=validator
-                )
+        List[ValidatorType],
+        Tuple[ValidatorType, ...],
+    ] = kwargs.get('validator')
+    if validator is None:
+        # A single validator is used by attrs as-is, without an and_() wrapper
+        validator = validate_required
+    elif isinstance(validator, (list, tuple)):
+        validator = (validate_required, *validator)
+    elif callable(validator):
+        validator = (validate_required, validator)
+    else:
+        raise TypeError(
+            'validator is not callable: {validator!r}'.format(
+                validator=validator
             )
-
-        validator = [validator]
-
-    validator = [validate_required] + validator
+        )
 
     kwargs['validator'] = validator
-
-
-    kwargs.setdefault('validator', [])
     return attr.ib(**kwargs)
 
 
@@ -164,7 +265,7 @@ def attr_required(**kwargs):
 # ------------------------------------------------------------------------------
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Info(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#infoObject
@@ -180,7 +281,7 @@ class Info(Base):
     )
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Contact(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#contactObject
@@ -190,7 +291,7 @@ class Contact(Base):
     email: str = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class License(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#licenseObject
@@ -199,7 +300,7 @@ class License(Base):
     url: str = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class OpenAPI(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#openapi-object
@@ -216,8 +317,42 @@ class OpenAPI(Base):
     tags: List['Tag'] = attr_skippable()
     external_docs: 'ExternalDocs' = attr_skippable()
 
+    #: Serialized document, see :any:`freeze`.
+    _frozen: Optional[Dict[str, Any]] = attr.ib(
+        default=None,
+        init=False,
+        repr=False,
+        cmp=False,
+        metadata=dict(
+            non_spec=True
+        )
+    )
+
+    def freeze(self) -> Dict[str, Any]:
+        """
+        Serialize the document once, for when it is complete and will be
+        served as-is. :any:`serialize_spec` returns the same dict from then
+        on, later changes to the document are not reflected in it until
+        ``freeze()`` is called again.
+
+        .. warning::
 
-@attr.s(slots=True)
+            The returned dict is shared by every later :any:`serialize_spec`
+            call and must not be modified. Make a copy, e.g. with
+            :func:`copy.deepcopy`, to post-process it.
+
+        >>> from openapilib.serialization import serialize_spec
+        >>> spec = OpenAPI(info=Info(title='Pets'), paths={})
+        >>> spec.freeze() is serialize_spec(spec)
+        True
+        """
+        from .serialization import serialize_spec
+        self._frozen = None
+        self._frozen = serialize_spec(self)
+        return self._frozen
+
+
+@attr.s(slots=True, cmp=False)
 class PathItem(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#pathItemObject
@@ -238,7 +373,7 @@ class PathItem(Base):
     parameters: Skippable[List['Parameter']] = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Operation(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#operation-object
@@ -255,25 +390,19 @@ class Operation(Base):
 
     def add_tags(self, *tags):
         if self.tags is SKIP:
-            self.tags = set()
-
-        self.tags |= set(tags)
-
-    def _validate_responses(self, attribute, value):
-        assert isinstance(value, dict)
-        for k, v in value.items():
-            assert isinstance(k, str)
-            assert isinstance(v, Response)
+            self.tags = set(tags)
+        else:
+            self.tags.update(tags)
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Parameter(Base, MayBeReferenced):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#parameter-object
     """
     name: str = attr_required()
     in_: str = attr_required(
-        default=ParameterLocation.QUERY,
+        default=ParameterLocation.QUERY.value,
         convert=enum_to_string,
     )
     description: str = attr_skippable()
@@ -283,7 +412,7 @@ class Parameter(Base, MayBeReferenced):
     schema: Skippable['Schema'] = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class RequestBody(Base, MayBeReferenced):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#request-body-object
@@ -292,7 +421,7 @@ class RequestBody(Base, MayBeReferenced):
     description: str = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Response(Base, MayBeReferenced):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#response-object
@@ -301,7 +430,7 @@ class Response(Base, MayBeReferenced):
     content: Dict[str, 'MediaType'] = attr_skippable()
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class MediaType(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#media-type-object
@@ -337,6 +466,15 @@ SCHEMA_SIMPLE_TYPE_ARGS = {
     )
 }
 
+# Entries are read-only, since shared Schema instances are created from
+# them. The compiler only interns identifier-like literals, 'date-time' is not.
+for _type, _params in SCHEMA_SIMPLE_TYPE_ARGS.items():
+    SCHEMA_SIMPLE_TYPE_ARGS[_type] = MappingProxyType({
+        key: sys.intern(value)
+        for key, value in _params.items()
+    })
+del _type, _params
+
 
 class SchemaHelperError(Exception):
     pass
@@ -350,7 +488,7 @@ class SchemaHelperUnhandled(Exception):
     pass
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Schema(Base, MayBeReferenced):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#schema-object
@@ -397,48 +535,134 @@ class Schema(Base, MayBeReferenced):
             cls,
             source: SchemaSourceType,
             fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
             **kwargs
     ) -> 'Schema':
+        """
+        Create a Schema from any of the sources handled by the
+        ``from_*`` helpers.
+
+        Results are cached when ``source`` and ``kwargs`` are hashable, the
+        returned Schema may therefore be shared between callers and should not
+        be mutated. Classes converted by :any:`from_user_type` are not cached,
+        but type hints are: ``List[Pet]`` reflects ``Pet`` as it was the first
+        time the hint was converted.
+
+        >>> Schema.from_type(int) is Schema.from_type(int)
+        True
+
+        ``fallback_handler`` is tried before a class is converted as a user
+        type, and for sources that are not handled otherwise:
+
+        >>> import uuid
+        >>> def uuid_schema(source, kwargs):
+        ...     if source is uuid.UUID:
+        ...         return Schema(type='string', format='uuid', **kwargs)
+        ...
+        >>> print(Schema.from_type(uuid.UUID, fallback_handler=uuid_schema))
+        {
+          "type": "string",
+          "format": "uuid"
+        }
+
+        :any:`Schema` has no ``nullable``, ``Optional[...]`` hints are not
+        supported:
+
+        >>> Schema.from_type(Optional[int])
+        Traceback (most recent call last):
+        ...
+        openapilib.spec.SchemaHelperError: Could not create schemas ...
+        """
         if isinstance(source, (Schema, Reference)):
             # Allow a pre-made Schema/Reference to be passed in directly
             return source
 
-        HandlerType = Callable[[SchemaSourceType], Schema]
+        if _visited or (isinstance(source, type) and _is_user_type(source)):
+            # Inside of a user type, the result may refer back to a type that
+            # is still being built and is not valid on its own. User types
+            # themselves may gain attributes after they are first converted.
+            return cls._from_type(
+                source,
+                fallback_handler=fallback_handler,
+                _visited=_visited,
+                **kwargs
+            )
+
+        try:
+            # The value type is part of the key, since e.g. 1 == True.
+            kwargs_key = frozenset(
+                (key, type(value), value)
+                for key, value in kwargs.items()
+            )
+            source_key = _source_key(source)
+            hash((source_key, fallback_handler, kwargs_key))
+        except TypeError:
+            # Unhashable source or kwargs, e.g. a dict of properties.
+            return cls._from_type(
+                source,
+                fallback_handler=fallback_handler,
+                **kwargs
+            )
 
-        handlers: List[
-            Union[
-                HandlerType,
-                Tuple[HandlerType, bool]
-            ]
-        ] = [
-            cls.from_type_hint,
-            cls.from_builtin_simple_type,
-            (
-                cls.from_properties,
-                isinstance(source, dict),
-            ),
-            (
-                cls.from_user_type,
-                # Restrict the set of matched classes by only handling classes
-                # without base classes as "user type" classes
-                isinstance(source, type) and not source.__bases__,
-            ),
-        ]
+        return _from_type_cached(
+            cls,
+            source,
+            source_key,
+            fallback_handler,
+            kwargs_key,
+        )
 
+    @classmethod
+    def _from_type(
+            cls,
+            source: SchemaSourceType,
+            fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
+            **kwargs
+    ) -> 'Schema':
+        handlers: Tuple[Callable[..., Schema], ...]
+        fallback_tried = False
+
+        # Each check is done once, the handlers picked here do not repeat it.
+        # typing generics first, since e.g. List[int] is also a type.
+        if isinstance(source, _GENERIC_TYPES):
+            handlers = (cls._from_generic_type_hint,)
+        elif isinstance(source, type):
+            if _is_user_type(source):
+                # The fallback handler gets the first say on classes that
+                # look like user types, e.g. uuid.UUID.
+                handlers = (
+                    cls._from_builtin_simple_type,
+                    cls._from_fallback_handler,
+                    cls._from_user_type,
+                )
+                fallback_tried = True
+            else:
+                handlers = (cls._from_builtin_simple_type,)
+        elif isinstance(source, dict):
+            handlers = (cls.from_properties,)
+        elif isinstance(source, _TYPE_HINT_TYPES):
+            # ClassVar and Any
+            handlers = (cls.from_type_hint,)
+        else:
+            handlers = ()
+
+        debug = _log.isEnabledFor(logging.DEBUG)
+
+        # Handlers return None for sources they do not handle, raising and
+        # catching SchemaHelperUnhandled for every miss is comparatively slow.
         for handler in handlers:
-            if isinstance(handler, tuple):
-                handler, is_enabled = handler
-                if not is_enabled:
-                    continue
-
             try:
-                return handler(
+                schema = handler(
                     source,
                     fallback_handler=fallback_handler,
+                    _visited=_visited,
                     **kwargs
                 )
             except SchemaHelperUnhandled as exc:
-                _log.debug('%s raised %r', handler, exc)
+                if debug:
+                    _log.debug('%s raised %r', handler, exc)
+                continue
             except SchemaHelperError as exc:
                 raise exc
             except Exception as exc:
@@ -448,7 +672,13 @@ class Schema(Base, MayBeReferenced):
                     )
                 ) from exc
 
-        if fallback_handler is not None:
+            if schema is not None:
+                return schema
+
+            if debug:
+                _log.debug('%s did not handle %r', handler, source)
+
+        if fallback_handler is not None and not fallback_tried:
             schema = fallback_handler(
                 source,
                 kwargs
@@ -462,16 +692,59 @@ class Schema(Base, MayBeReferenced):
             )
         )
 
+    @classmethod
+    def _from_fallback_handler(
+            cls,
+            source: SchemaSourceType,
+            fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
+            **kwargs
+    ) -> Optional['Schema']:
+        if fallback_handler is None:
+            return None
+        return fallback_handler(source, kwargs)
+
+    @classmethod
+    def _from_user_type(
+            cls,
+            source: type,
+            fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
+            **kwargs
+    ) -> Optional['Schema']:
+        """
+        :any:`from_user_type`, returning ``None`` for classes without any
+        properties, e.g. :class:`bytes` or ``NoneType``.
+        """
+        if source is not object and not _user_type_properties(source):
+            return None
+
+        return cls.from_user_type(
+            source,
+            fallback_handler=fallback_handler,
+            _visited=_visited,
+            **kwargs
+        )
+
     @classmethod
     def from_user_type(
             cls,
             user_type: type,
             fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
             **kwargs
     ) -> 'Schema':
         """
         Create a Schema from a user-defined class object.
 
+        Methods, properties and other descriptors are not part of the schema.
+        Fields declared only through annotations, or attrs classes, are not
+        supported and raise :any:`SchemaHelperError`.
+
+        Classes that refer back to themselves, directly or through other
+        classes, are given a ``ref_name`` (the class name, unless one is
+        passed in ``kwargs``) and referenced from within themselves.
+
         Example:
 
         >>> class Book(object):
@@ -491,22 +764,51 @@ class Schema(Base, MayBeReferenced):
             }
           }
         }
+
+        >>> class Chapter(object):
+        ...     title = str
+        ...
+        >>> Chapter.subchapters = List[Chapter]
+        >>> Schema.from_user_type(Chapter).ref_name
+        'Chapter'
         """
-        return cls.from_properties(
-            properties={
-                key: value
-                for key, value in user_type.__dict__.items()
-                if not key.startswith('_')
-            },
-            fallback_handler=fallback_handler,
-            **kwargs,
-        )
+        if _visited is None:
+            _visited = {}
+        elif user_type in _visited:
+            # Recursive type, refer to the definition that is being built.
+            reference = _visited[user_type]
+            if reference is None:
+                reference = _visited[user_type] = Reference(
+                    ref=f'#/components/schemas/{user_type.__name__}'
+                )
+            return reference
+
+        _visited[user_type] = None
+        try:
+            schema = cls.from_properties(
+                properties=_user_type_properties(user_type),
+                fallback_handler=fallback_handler,
+                _visited=_visited,
+                **kwargs,
+            )
+        finally:
+            reference = _visited.pop(user_type)
+
+        if reference is not None:
+            # The definition has to be stored in Components for the reference
+            # to resolve.
+            if schema.ref_name is None:
+                schema.ref_name = user_type.__name__
+            reference.ref = f'#/components/schemas/{schema.ref_name}'
+
+        return schema
 
     @classmethod
     def from_properties(
             cls,
             properties: Dict,
             fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
             **kwargs
     ):
         """
@@ -540,13 +842,37 @@ class Schema(Base, MayBeReferenced):
         }
 
         """
+        # Models tend to repeat a handful of property types, resolve each
+        # distinct type once. Like from_type's own cache, user types are left
+        # out, each property gets a Schema of its own.
+        resolved: Dict[Any, Schema] = {}
+
+        from_type = functools.partial(
+            Schema.from_type,
+            fallback_handler=fallback_handler,
+            _visited=_visited,
+        )
+
+        def property_schema(value: SchemaSourceType) -> Schema:
+            if isinstance(value, type) and _is_user_type(value):
+                return from_type(value)
+
+            try:
+                key = _source_key(value)
+                schema = resolved.get(key)
+            except TypeError:
+                # Unhashable, e.g. a nested dict of properties.
+                return from_type(value)
+
+            if schema is None:
+                schema = resolved[key] = from_type(value)
+            return schema
+
         try:
             return cls(
                 type='object',
                 properties={
-                    key: Schema.from_type(
-                        value,
-                        fallback_handler=fallback_handler)
+                    key: property_schema(value)
                     for key, value in properties.items()
                 },
                 **kwargs
@@ -563,6 +889,7 @@ class Schema(Base, MayBeReferenced):
             cls,
             hint: SchemaTypingSourceType,
             fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
             **kwargs,
     ) -> Skippable['Schema']:
         """
@@ -579,100 +906,93 @@ class Schema(Base, MayBeReferenced):
           }
         }
 
+        >>> print(Schema.from_type_hint(Union[int, str]))
+        {
+          "anyOf": [
+            {
+              "type": "integer",
+              "format": "int64"
+            },
+            {
+              "type": "string"
+            }
+          ]
+        }
+
+        >>> print(Schema.from_type_hint(List))
+        {
+          "type": "array"
+        }
+
         """
-        if isinstance(hint, type(ClassVar)):
+        if isinstance(hint, _CLASSVAR_TYPE):
             return cls.from_type(
                 hint.__type__,
                 fallback_handler=fallback_handler,
+                _visited=_visited,
                 **kwargs
             )
 
-        if isinstance(hint, type(Any)):
+        if isinstance(hint, _ANY_TYPE):
             return cls()
 
-        generic_types = (
-            type(List),
-            type(Dict),
-            type(Union),
-        )
-
-        if not isinstance(hint, generic_types):
+        if not isinstance(hint, _GENERIC_TYPES):
             raise SchemaHelperUnhandled(
                 '{hint} is not a type hint.'.format(hint=hint)
             )
 
-        origin = getattr(hint, '__origin__', hint)
-
-        hint_arg_types: List[Schema] = []
-
-        if hasattr(hint, '__args__'):
-            try:
-                hint_arg_types = [
-                    Schema.from_type(
-                        arg,
-                        fallback_handler=fallback_handler
-                    )
-                    for arg in hint.__args__
-                ]
-            except SchemaHelperError as exc:
-                raise SchemaHelperError(
-                    'Could not create schemas for type '
-                    'hint\'s argument types. Hint: {hint}'.format(
-                        hint=hint
-                    )
-                ) from exc
-
-        # We're dealing with a typing.* object
-        if origin is List:
-            items = SKIP
-            if hint_arg_types:
-                items = hint_arg_types[0]
+        return cls._from_generic_type_hint(
+            hint,
+            fallback_handler=fallback_handler,
+            _visited=_visited,
+            **kwargs
+        )
 
-            return cls(
-                type='array',
-                items=items,
-                **kwargs,
+    @classmethod
+    def _from_generic_type_hint(
+            cls,
+            hint: SchemaTypingSourceType,
+            fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
+            **kwargs,
+    ) -> 'Schema':
+        """
+        :any:`from_type_hint` for hints already known to be one of
+        ``_GENERIC_TYPES``, e.g. ``List[int]``.
+        """
+        # Unsubscripted hints, e.g. List, have neither origin nor arguments.
+        origin = hint.__origin__ or hint
+        handler = _ORIGIN_HANDLERS.get(origin)
+        if handler is None:
+            raise SchemaHelperError(
+                'Unsupported type hint: {hint}'.format(hint=hint)
             )
 
-        if origin is Union:
-            if hint_arg_types:
-                return cls(
-                    any_of=hint_arg_types,
+        try:
+            hint_arg_types = [
+                Schema.from_type(
+                    arg,
                     fallback_handler=fallback_handler,
-                    **kwargs
+                    _visited=_visited,
                 )
-            else:
-                return cls()
-
-        if origin is Dict:
-            value_schema = SKIP
-
-            if len(hint_arg_types) >= 2:
-                value_schema = hint_arg_types[1]
-
-            return cls(
-                type='object',
-                additional_properties=value_schema,
-                **kwargs,
-            )
-
-        if origin is ClassVar:
-            if hint_arg_types:
-                return cls.from_type(
-                    hint_arg_types[0],
-                    fallback_handler=fallback_handler,
-                    **kwargs
+                for arg in hint.__args__ or ()
+            ]
+        except SchemaHelperError as exc:
+            raise SchemaHelperError(
+                'Could not create schemas for type '
+                'hint\'s argument types. Hint: {hint}'.format(
+                    hint=hint
                 )
+            ) from exc
 
-        raise SchemaHelperError(
-            'Unsupported type hint: {hint}'.format(hint=hint)
-        )
+        return handler(cls, hint_arg_types, kwargs)
 
     @classmethod
     def from_builtin_simple_type(
             cls,
             source: SchemaSimpleSourceType,
             fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
             **kwargs,
     ) -> Skippable['Schema']:
         """
@@ -694,29 +1014,169 @@ class Schema(Base, MayBeReferenced):
           "type": "integer",
           "format": "int64"
         }
+
+        Without ``kwargs``, the types above and their subclasses return a
+        shared Schema instance, which should not be mutated.
         """
         if not isinstance(source, type):
-            _log.debug('%r is not a simple type.', source)
             raise SchemaHelperUnhandled(
                 '{source!r} is not a type'.format(source=source)
             )
 
-        for base, params in SCHEMA_SIMPLE_TYPE_ARGS.items():
-            if issubclass(source, base):
-                return cls(
-                    **params,
-                    **kwargs,
+        schema = cls._from_builtin_simple_type(source, **kwargs)
+        if schema is None:
+            raise SchemaHelperUnhandled(
+                '{type} is not a subclass of any of {simple_types}'.format(
+                    type=source,
+                    simple_types=SCHEMA_SIMPLE_TYPE_ARGS.keys()
                 )
+            )
+
+        return schema
+
+    @classmethod
+    def _from_builtin_simple_type(
+            cls,
+            source: type,
+            fallback_handler: SchemaFallbackHandlerType=None,
+            _visited: Optional[SchemaVisitedType]=None,
+            **kwargs,
+    ) -> Optional['Schema']:
+        """
+        :any:`from_builtin_simple_type`, returning ``None`` for types that
+        are not handled.
+        """
+        # Fast path for the common case of an exact match, e.g. int or str,
+        # or a subclass that has been matched before.
+        base = _SIMPLE_TYPE_BASES.get(source, source)
+        params = SCHEMA_SIMPLE_TYPE_ARGS.get(base)
+
+        if params is None:
+            for base, params in SCHEMA_SIMPLE_TYPE_ARGS.items():
+                if issubclass(source, base):
+                    _SIMPLE_TYPE_BASES[source] = base
+                    break
+            else:
+                return None
 
-        raise SchemaHelperUnhandled(
-            '{type} is not a subclass of any of {simple_types}'.format(
-                type=type(source),
-                simple_types=SCHEMA_SIMPLE_TYPE_ARGS.keys()
+        if kwargs or cls is not Schema:
+            return cls(
+                **params,
+                **kwargs,
             )
+
+        # Rebuilt if the SCHEMA_SIMPLE_TYPE_ARGS entry has been replaced.
+        shared = _SIMPLE_SCHEMAS.get(base)
+        if shared is None or shared[0] is not params:
+            shared = _SIMPLE_SCHEMAS[base] = (params, cls(**params))
+        return shared[1]
+
+
+def _list_hint_schema(
+        cls: Type[Schema],
+        hint_arg_types: List[Schema],
+        kwargs: Dict[str, Any],
+) -> Schema:
+    items = SKIP
+    if hint_arg_types:
+        items = hint_arg_types[0]
+
+    return cls(
+        type='array',
+        items=items,
+        **kwargs,
+    )
+
+
+def _union_hint_schema(
+        cls: Type[Schema],
+        hint_arg_types: List[Schema],
+        kwargs: Dict[str, Any],
+) -> Schema:
+    if hint_arg_types:
+        return cls(
+            any_of=hint_arg_types,
+            **kwargs
         )
+    else:
+        return cls()
+
+
+def _dict_hint_schema(
+        cls: Type[Schema],
+        hint_arg_types: List[Schema],
+        kwargs: Dict[str, Any],
+) -> Schema:
+    value_schema = SKIP
+
+    if len(hint_arg_types) >= 2:
+        value_schema = hint_arg_types[1]
+
+    return cls(
+        type='object',
+        additional_properties=value_schema,
+        **kwargs,
+    )
+
+
+#: Matching :any:`SCHEMA_SIMPLE_TYPE_ARGS` key by subclass, populated by
+#: :any:`Schema.from_builtin_simple_type`.
+_SIMPLE_TYPE_BASES: Dict[type, type] = {}
 
+#: Shared Schema instance by :any:`SCHEMA_SIMPLE_TYPE_ARGS` key, along with
+#: the entry it was created from, see :any:`Schema.from_builtin_simple_type`.
+_SIMPLE_SCHEMAS: Dict[type, Tuple[Mapping[str, str], Schema]] = {}
 
-@attr.s(slots=True)
+#: Schema constructors for generic type hints by the hint's ``__origin__``,
+#: called with the Schema class, the schemas of the hint's arguments and any
+#: additional kwargs. See :any:`Schema.from_type_hint`.
+_ORIGIN_HANDLERS: Dict[
+    Any,
+    Callable[[Type[Schema], List[Schema], Dict[str, Any]], Schema]
+] = {
+    List: _list_hint_schema,
+    Union: _union_hint_schema,
+    Dict: _dict_hint_schema,
+}
+
+
+def _source_key(source: SchemaSourceType) -> Any:
+    """
+    Hashable key for a :any:`Schema.from_type` source. Type hints compare
+    equal regardless of the order of ``Union`` arguments, their arguments are
+    therefore part of the key, in order.
+
+    >>> _source_key(Union[int, str]) == _source_key(Union[str, int])
+    False
+    """
+    if isinstance(source, _CLASSVAR_TYPE):
+        return source, _source_key(source.__type__)
+
+    args = getattr(source, '__args__', None)
+    if not args:
+        return source
+
+    return source, tuple(_source_key(arg) for arg in args)
+
+
+# Bounded, since types passed to from_type would otherwise be kept alive for
+# the lifetime of the process.
+@functools.lru_cache(maxsize=4096)
+def _from_type_cached(
+        cls: Type[Schema],
+        source: SchemaSourceType,
+        source_key: Any,
+        fallback_handler: SchemaFallbackHandlerType,
+        kwargs_key: frozenset,
+) -> Schema:
+    return cls._from_type(
+        source,
+        fallback_handler=fallback_handler,
+        **{key: value for key, _, value in kwargs_key}
+    )
+
+
+@attr.s(slots=True, cmp=False)
 class Reference(Base):
     ref: str = attr_required(
         metadata=dict(
@@ -732,6 +1192,10 @@ COMPONENT_TYPES = {
     RequestBody: 'request_bodies',
 }
 
+#: Component type by concrete spec class, populated by
+#: :any:`Components.component_type_for_spec`.
+_COMPONENT_TYPE_CACHE: Dict[type, str] = {}
+
 
 class ComponentType(Generic[T_co], extra=MayBeReferenced):
     __slots__ = ()
@@ -742,10 +1206,14 @@ T_Registry = Dict[str, Union[T_Component, 'Reference']]
 
 
 def attr_registry(**kwargs):
-    return attr_skippable(**kwargs)
+    # Always a dict, rather than SKIP until the first component is stored.
+    # Empty registries are left out of the serialized output instead.
+    kwargs.setdefault('default', attr.Factory(dict))
+    kwargs.setdefault('metadata', {}).setdefault('skip_empty', True)
+    return attr.ib(**kwargs)
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, cmp=False)
 class Components(Base):
     """
     https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#componentsObject
@@ -761,64 +1229,76 @@ class Components(Base):
     links: T_Registry['Link'] = attr_registry()
     callbacks: T_Registry['Callback'] = attr_registry()
 
-    def get_registry_for_spec(
-            self,
-            spec: T_Component
-    ) -> Optional[T_Registry[T_Component]]:
-        registry: Skippable[T_Registry[T_Component]] = getattr(
-            self,
-            self.component_type_for_spec(spec)
+    #: Reference objects by ``(component_type, ref_name)``, see
+    #: :any:`get_ref`.
+    _ref_cache: Dict[Tuple[str, str], 'Reference'] = attr.ib(
+        default=attr.Factory(dict),
+        init=False,
+        repr=False,
+        cmp=False,
+        metadata=dict(
+            non_spec=True
         )
-        if registry is not SKIP:
-            return registry
-
-        _log.debug('Registry for type %s does not exist', type(spec))
-        return None
+    )
 
-    def create_registry_for_spec(
+    def get_registry_for_spec(
             self,
             spec: T_Component
     ) -> T_Registry[T_Component]:
-        registry = self.get_registry_for_spec(spec)
-        if registry is not None:
-            return registry
+        return getattr(self, self.component_type_for_spec(spec))
 
-        registry: T_Registry[T_Component] = {}
-        setattr(self, self.component_type_for_spec(spec), registry)
-        return registry
+    # Registries always exist, kept for backwards compatibility.
+    create_registry_for_spec = get_registry_for_spec
 
     @staticmethod
     def component_type_for_spec(spec: T_Component):
+        """
+        Name of the Components registry for ``spec``, resolved once per
+        concrete spec class.
+
+        >>> Components.component_type_for_spec(Schema())
+        'schemas'
+        >>> class ErrorResponse(Response):
+        ...     pass
+        ...
+        >>> Components.component_type_for_spec(ErrorResponse(description=''))
+        'responses'
+        """
+        spec_type = type(spec)
+        component_type = _COMPONENT_TYPE_CACHE.get(spec_type)
+        if component_type is not None:
+            return component_type
+
         for base, component_type in COMPONENT_TYPES.items():
-            if isinstance(spec, base):
+            if issubclass(spec_type, base):
+                _COMPONENT_TYPE_CACHE[spec_type] = component_type
                 return component_type
 
         raise TypeError(
-            'Unhandled type: {spec}'.format(type=type(spec))
+            'Unhandled type: {type}'.format(type=spec_type)
         )
 
     def get_ref_str(self, spec: T_Component) -> str:
-        return posixpath.join(
-            '#/components',
-            self.component_type_for_spec(spec),
-            spec.ref_name
-        )
+        component_type = self.component_type_for_spec(spec)
+        return f'#/components/{component_type}/{spec.ref_name}'
 
     def get_ref(self, spec: T_Component) -> 'Reference':
-        return Reference(
-            ref=self.get_ref_str(spec)
-        )
+        # Keyed by the parts of the reference string, which is then only
+        # formatted once per referenced component.
+        key = (self.component_type_for_spec(spec), spec.ref_name)
+        reference = self._ref_cache.get(key)
+        if reference is None:
+            reference = self._ref_cache[key] = Reference(
+                ref=self.get_ref_str(spec)
+            )
+        return reference
 
     def get_stored(self, spec: T_Component) -> Optional[T_Component]:
-        registry = self.get_registry_for_spec(spec)
-        if registry is None:
-            return
-        return registry.get(spec.ref_name)
+        return self.get_registry_for_spec(spec).get(spec.ref_name)
 
     def exists(self, spec: T_Component) -> bool:
         return self.get_stored(spec) is not None
 
     def store(self, spec: T_Component) -> 'Reference':
-        registry = self.create_registry_for_spec(spec)
-        registry[spec.ref_name] = spec
+        self.get_registry_for_spec(spec)[spec.ref_name] = spec
         return self.get_ref(spec)
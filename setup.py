@@ -3,7 +3,6 @@ import warnings
 from setuptools import setup, find_packages
 
 install_requires = [
-    'stringcase >=1.2.0',
     'deepdiff >=3.3.0',
     'attrs >=17.2.0',
 ]